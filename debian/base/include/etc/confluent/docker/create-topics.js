@@ -0,0 +1,189 @@
+/*
+ * Copyright 2019 Confluent Inc.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Creates declared topics with a single AdminClient in a single JVM.
+ *
+ * Run with the Nashorn shell of the JRE and the Kafka jars on the classpath:
+ *
+ *     jjs -cp <kafka jars> create-topics.js -- <bootstrap servers> <listener name>
+ *         <security protocol> <broker properties> <min brokers> <timeout seconds> <topics file>
+ *
+ * The topics file is the JSON array of {name, partitions, replicationFactor,
+ * configs} that topic-specs wrote from KAFKA_CREATE_TOPICS and
+ * KAFKA_CREATE_TOPICS_FILE when the broker was configured, after validating
+ * the specs.
+ *
+ * Waits until <min brokers> brokers (default: the largest replication factor)
+ * are up, then creates all the topics that do not exist yet in one
+ * createTopics call. The client uses the ssl.* settings of the broker
+ * properties, overridden by those of the listener. On a SASL listener, it
+ * authenticates with the inter-broker mechanism and the sasl.jaas.config of
+ * the listener for that mechanism or else the KafkaClient section of the JAAS
+ * file of java.security.auth.login.config (see KAFKA_OPTS). See create_topics
+ * in /etc/confluent/docker/bash-functions.
+ */
+
+var ArrayList = Java.type("java.util.ArrayList");
+var HashMap = Java.type("java.util.HashMap");
+var Properties = Java.type("java.util.Properties");
+var FileInputStream = Java.type("java.io.FileInputStream");
+var Files = Java.type("java.nio.file.Files");
+var Paths = Java.type("java.nio.file.Paths");
+var JavaString = Java.type("java.lang.String");
+var ExecutionException = Java.type("java.util.concurrent.ExecutionException");
+var TimeUnit = Java.type("java.util.concurrent.TimeUnit");
+var AdminClient = Java.type("org.apache.kafka.clients.admin.AdminClient");
+var NewTopic = Java.type("org.apache.kafka.clients.admin.NewTopic");
+var TopicExistsException = Java.type("org.apache.kafka.common.errors.TopicExistsException");
+
+// Broker settings with an ssl. prefix that are not client settings.
+var BROKER_SSL_PROPS = ["ssl.client.auth", "ssl.principal.mapping.rules"];
+// Client settings of the sasl.* broker settings.
+var CLIENT_SASL_PREFIXES = ["sasl.kerberos.service.name", "sasl.kerberos.kinit.cmd", "sasl.kerberos.ticket.renew.",
+                            "sasl.kerberos.min.time.before.relogin", "sasl.login."];
+
+function readTopics(path) {
+    return JSON.parse(new JavaString(Files.readAllBytes(Paths.get(path)), "UTF-8")).map(function (topic) {
+        var configs = new HashMap();
+        Object.keys(topic.configs).forEach(function (name) {
+            configs.put(name, topic.configs[name]);
+        });
+        return {name: topic.name, partitions: topic.partitions, replicationFactor: topic.replicationFactor, configs: configs};
+    });
+}
+
+function startsWithAny(name, prefixes) {
+    return prefixes.some(function (prefix) { return name.indexOf(prefix) == 0; });
+}
+
+function hasKafkaClientJaasSection() {
+    var path = java.lang.System.getProperty("java.security.auth.login.config");
+    if (!path) {
+        return false;
+    }
+    try {
+        return /(^|[\s;}])KafkaClient\s*\{/.test(new JavaString(Files.readAllBytes(Paths.get(path)), "UTF-8"));
+    } catch (e) {
+        return false;
+    }
+}
+
+function clientProperties(bootstrap, listenerName, protocol, brokerProperties) {
+    var broker = new Properties();
+    var stream = new FileInputStream(brokerProperties);
+    try {
+        broker.load(stream);
+    } finally {
+        stream.close();
+    }
+    var listenerPrefix = "listener.name." + listenerName.toLowerCase() + ".";
+    var props = new Properties();
+    broker.stringPropertyNames().forEach(function (name) {
+        if (name.indexOf("ssl.") == 0 && BROKER_SSL_PROPS.indexOf(name) < 0) {
+            props.put(name, broker.getProperty(name));
+        } else if (startsWithAny(name, CLIENT_SASL_PREFIXES)) {
+            props.put(name, broker.getProperty(name));
+        }
+    });
+    broker.stringPropertyNames().forEach(function (name) {
+        var unprefixed = name.substring(listenerPrefix.length);
+        if (name.indexOf(listenerPrefix + "ssl.") == 0 && BROKER_SSL_PROPS.indexOf(unprefixed) < 0) {
+            props.put(unprefixed, broker.getProperty(name));
+        }
+    });
+
+    if (protocol.indexOf("SASL_") == 0) {
+        var mechanism = broker.getProperty("sasl.mechanism.inter.broker.protocol", "GSSAPI");
+        var jaasConfig = broker.getProperty(listenerPrefix + mechanism.toLowerCase() + ".sasl.jaas.config");
+        props.put("sasl.mechanism", mechanism);
+        if (jaasConfig) {
+            props.put("sasl.jaas.config", jaasConfig);
+        } else if (!hasKafkaClientJaasSection()) {
+            throw new Error("Cannot create topics on the " + protocol + " listener " + listenerName + ": set " +
+                            listenerPrefix + mechanism.toLowerCase() + ".sasl.jaas.config or add a KafkaClient " +
+                            "section to the JAAS file of java.security.auth.login.config in KAFKA_OPTS.");
+        }
+    }
+    props.put("bootstrap.servers", bootstrap);
+    props.put("security.protocol", protocol);
+    return props;
+}
+
+function waitForBrokers(admin, minBrokers, deadline) {
+    while (true) {
+        try {
+            var brokers = admin.describeCluster().nodes().get(5, TimeUnit.SECONDS).size();
+            if (brokers >= minBrokers) {
+                return;
+            }
+            print("===> Waiting for " + minBrokers + " brokers before creating topics, " + brokers + " up ...");
+        } catch (e) {
+            print("===> Waiting for the cluster before creating topics: " + e);
+        }
+        if (Date.now() > deadline) {
+            throw new Error("Timed out waiting for " + minBrokers + " brokers.");
+        }
+        java.lang.Thread.sleep(2000);
+    }
+}
+
+function run(args) {
+    var specs = readTopics(args[6]);
+    if (specs.length == 0) {
+        return;
+    }
+    var minBrokers = parseInt(args[4]) || Math.max.apply(null, specs.map(function (s) { return s.replicationFactor; }));
+    var deadline = Date.now() + parseInt(args[5]) * 1000;
+    var admin = AdminClient.create(clientProperties(args[0], args[1], args[2], args[3]));
+    try {
+        waitForBrokers(admin, minBrokers, deadline);
+        var existing = admin.listTopics().names().get();
+        var topics = new ArrayList();
+        var skipped = [];
+        specs.forEach(function (spec) {
+            if (existing.contains(spec.name)) {
+                skipped.push(spec.name);
+            } else {
+                topics.add(new NewTopic["(String,int,short)"](spec.name, spec.partitions, spec.replicationFactor).configs(spec.configs));
+            }
+        });
+
+        var created = [];
+        var failed = [];
+        var results = admin.createTopics(topics).values();
+        results.keySet().forEach(function (name) {
+            try {
+                results.get(name).get();
+                created.push(name);
+            } catch (e) {
+                if (e instanceof ExecutionException && e.getCause() instanceof TopicExistsException) {
+                    skipped.push(name);
+                } else {
+                    failed.push(name + " (" + (e instanceof ExecutionException ? e.getCause() : e) + ")");
+                }
+            }
+        });
+        print("===> Created topics: " + (created.join(", ") || "none") + "; already existing: " + (skipped.join(", ") || "none"));
+        if (failed.length > 0) {
+            throw new Error("Could not create topics: " + failed.join(", "));
+        }
+    } finally {
+        admin.close();
+    }
+}
+
+run(arguments);
@@ -0,0 +1,60 @@
+#
+# Copyright 2019 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Startup trace events for the Python tools in /etc/confluent/docker.
+
+Writes the same JSON lines as trace_event in bash-functions: one line per
+step on stdout, appended to CONFLUENT_STARTUP_TRACE_FILE as well. The phase
+defaults to CONFLUENT_STARTUP_PHASE, which trace_step exports for the
+configure, ensure and launch phases. CONFLUENT_STARTUP_TRACE=false disables
+tracing.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+
+DEFAULT_TRACE_FILE = "/var/log/confluent/startup-trace.json"
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def emit(step, start_ms, end_ms=None, status="ok", phase=None, **extra):
+    if os.environ.get("CONFLUENT_STARTUP_TRACE", "true").lower() == "false":
+        return
+    if end_ms is None:
+        end_ms = now_ms()
+    event = {
+        "component": os.environ.get("COMPONENT", ""),
+        "phase": phase or os.environ.get("CONFLUENT_STARTUP_PHASE", ""),
+        "step": step,
+        "start_ms": start_ms,
+        "duration_ms": end_ms - start_ms,
+        "status": status,
+    }
+    event.update(extra)
+    line = json.dumps(event, sort_keys=True)
+    print(line)
+    sys.stdout.flush()
+    try:
+        with open(os.environ.get("CONFLUENT_STARTUP_TRACE_FILE", DEFAULT_TRACE_FILE), "a") as f:
+            f.write(line + "\n")
+    except (IOError, OSError):
+        pass
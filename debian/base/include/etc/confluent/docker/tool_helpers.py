@@ -0,0 +1,154 @@
+#
+# Copyright 2019 Confluent Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers shared by the Python tools in /etc/confluent/docker.
+
+Properties files, env defaults, thread-safe reports, a worker pool and a
+minimal JSON client of the REST API of a service in the same container.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+
+try:
+    from httplib import HTTPConnection, HTTPSConnection
+    from Queue import Empty, Queue
+    from urlparse import urlparse
+except ImportError:
+    from http.client import HTTPConnection, HTTPSConnection
+    from queue import Empty, Queue
+    from urllib.parse import urlparse
+
+WILDCARD_HOSTS = ("", "0.0.0.0", "::", "[::]")
+
+# Serializes the report lines of the threads of run_parallel.
+output_lock = threading.Lock()
+
+
+def read_properties(path):
+    props = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                name, _, value = line.partition("=")
+                props[name.strip()] = value.strip()
+    return props
+
+
+def prefixed_env(prefix):
+    """Returns env(name, default), which reads the env var <prefix><name>, e.g. the default of an option."""
+    def env(name, default):
+        return os.environ.get(prefix + name) or default
+    return env
+
+
+def report(message):
+    with output_lock:
+        print(message)
+        sys.stdout.flush()
+
+
+def run_parallel(work, items, parallelism):
+    """Calls work(item) for every item, on up to parallelism threads."""
+    queue = Queue()
+    for item in items:
+        queue.put(item)
+
+    def work_all():
+        while True:
+            try:
+                item = queue.get_nowait()
+            except Empty:
+                return
+            work(item)
+
+    threads = [threading.Thread(target=work_all) for _ in range(min(parallelism, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def local_host(host):
+    return "127.0.0.1" if host in WILDCARD_HOSTS else host.strip("[]")
+
+
+def unverified_context():
+    # The tools connect to localhost, which the certificates are not issued for.
+    context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def message(result):
+    return result.get("message", "") if isinstance(result, dict) else ""
+
+
+class RestClient(object):
+    """A minimal JSON client of the REST API of a service in this container."""
+
+    content_type = "application/json"
+    error = RuntimeError
+
+    def __init__(self, url, timeout=10):
+        parsed = urlparse(url)
+        self.https = parsed.scheme == "https"
+        self.host = local_host(parsed.hostname or "")
+        self.port = parsed.port or (443 if self.https else 80)
+        self.timeout = timeout
+
+    def retryable(self, status):
+        return status >= 500
+
+    def request(self, method, path, body=None):
+        """Returns (status, decoded JSON body or None)."""
+        if self.https:
+            connection = HTTPSConnection(self.host, self.port, timeout=self.timeout, context=unverified_context())
+        else:
+            connection = HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            headers = {"Content-Type": self.content_type, "Accept": self.content_type}
+            connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = connection.getresponse()
+            data = response.read()
+            try:
+                return response.status, json.loads(data.decode("utf-8")) if data else None
+            except ValueError:
+                return response.status, None
+        finally:
+            connection.close()
+
+    def retry(self, method, path, body, deadline, interval):
+        """Retries while the service is unreachable or answers with a retryable status."""
+        while True:
+            try:
+                status, result = self.request(method, path, body)
+                if not self.retryable(status):
+                    return status, result
+                error = "%s %s" % (status, message(result))
+            except (socket.error, socket.timeout, ssl.SSLError) as e:
+                error = str(e)
+            if time.time() > deadline:
+                raise self.error("%s %s failed: %s" % (method, path, error))
+            time.sleep(interval)
@@ -0,0 +1,110 @@
+"""Restarts the brokers of a compose cluster one at a time.
+
+Each step restarts one broker service, waits for the broker to register in
+ZooKeeper again and for the under-replicated partitions to reach zero, and
+records how long that took. After the last step a preferred leader election
+moves leadership back to the preferred replicas.
+
+    python rolling_restart.py fixtures/debian/kafka cluster-bridged-plain.yml cluster-test \
+        kafka-1 kafka-2 kafka-3 --output timings.json
+"""
+import argparse
+import json
+import re
+import time
+
+import utils
+
+BROKER_IDS = "bash -c 'zookeeper-shell $KAFKA_ZOOKEEPER_CONNECT ls /brokers/ids'"
+UNDER_REPLICATED = "bash -c 'kafka-topics --describe --under-replicated-partitions --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
+PREFERRED_ELECTION = "bash -c 'kafka-preferred-replica-election --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
+
+
+class RollingRestartError(Exception):
+    pass
+
+
+class RollingRestart(object):
+
+    def __init__(self, cluster, services, stop_timeout=60, step_timeout=300, poll_interval=2):
+        self.cluster = cluster
+        self.services = services
+        self.stop_timeout = stop_timeout
+        self.step_timeout = step_timeout
+        self.poll_interval = poll_interval
+
+    def admin_service(self, restarting):
+        # Admin commands run on a broker that is not being restarted.
+        return [s for s in self.services if s != restarting][0]
+
+    def broker_ids(self, service):
+        output = self.cluster.run_command_on_service(service, BROKER_IDS)
+        match = re.search(r"\[([\d, ]*)\]\s*$", output.strip())
+        if not match:
+            return set()
+        return set(int(i) for i in match.group(1).split(",") if i.strip())
+
+    def under_replicated(self, service):
+        output = self.cluster.run_command_on_service(service, UNDER_REPLICATED)
+        return len([line for line in output.splitlines() if "Partition:" in line])
+
+    def wait_for(self, description, condition):
+        deadline = time.time() + self.step_timeout
+        while not condition():
+            if time.time() > deadline:
+                raise RollingRestartError("Timed out after %ss waiting for %s." % (self.step_timeout, description))
+            time.sleep(self.poll_interval)
+
+    def restart(self, service):
+        admin = self.admin_service(service)
+        brokers = self.broker_ids(admin)
+        step = {"service": service}
+
+        started = time.time()
+        container = self.cluster.get_container(service)
+        container.stop(timeout=self.stop_timeout)
+        step["stop_s"] = time.time() - started
+
+        container.start()
+        self.wait_for("%s to register" % service, lambda: self.broker_ids(admin) >= brokers)
+        step["rejoin_s"] = time.time() - started
+
+        self.wait_for("under-replicated partitions to reach zero", lambda: self.under_replicated(admin) == 0)
+        step["total_s"] = time.time() - started
+        step["catch_up_s"] = step["total_s"] - step["rejoin_s"]
+        print "Restarted %s: %s" % (service, json.dumps(step, sort_keys=True))
+        return step
+
+    def run(self):
+        started = time.time()
+        steps = []
+        for service in self.services:
+            steps.append(self.restart(service))
+
+        election_started = time.time()
+        print self.cluster.run_command_on_service(self.services[0], PREFERRED_ELECTION)
+        timings = {
+            "steps": steps,
+            "preferred_election_s": time.time() - election_started,
+            "total_s": time.time() - started,
+        }
+        print "Rolling restart done in %.1fs" % timings["total_s"]
+        return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restarts the brokers of a compose cluster one at a time.")
+    parser.add_argument("working_dir", help="Dir of the compose file.")
+    parser.add_argument("config_file", help="Compose file.")
+    parser.add_argument("name", help="Compose project name of the running cluster.")
+    parser.add_argument("services", nargs="+", help="Broker services, in restart order.")
+    parser.add_argument("--stop-timeout", type=int, default=60, help="Seconds to wait for a broker to stop.")
+    parser.add_argument("--step-timeout", type=int, default=300, help="Seconds to wait for a broker to catch up.")
+    parser.add_argument("--output", help="File to write the timings to, as JSON.")
+    args = parser.parse_args()
+
+    cluster = utils.TestCluster(args.name, args.working_dir, args.config_file)
+    timings = RollingRestart(cluster, args.services, args.stop_timeout, args.step_timeout).run()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(timings, f, indent=2, sort_keys=True)
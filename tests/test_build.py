@@ -28,6 +28,18 @@ class BaseImageTest(unittest.TestCase):
     def test_dub_exists(self):
         self.assertTrue(utils.path_exists_in_image(self.image, "/usr/local/bin/dub"))
         self.assertTrue(utils.path_exists_in_image(self.image, "/usr/local/bin/cub"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/dub-batch"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/preflight"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/storage-check"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/os-limits-check"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/page-cache-warmup"))
+        self.assertTrue(utils.path_exists_in_image(self.image, "/etc/confluent/docker/create-topics.js"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/topic-specs"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/healthcheck"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/connect-plugin-index"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/deploy-connectors"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/install-plugins"))
+        self.assertTrue(utils.executable_exists_in_image(self.image, "/etc/confluent/docker/preload-schemas"))
 
 
 class ZookeeperImageTest(unittest.TestCase):
@@ -87,6 +99,17 @@ class KafkaImageTest(unittest.TestCase):
         expected = "USAGE: /usr/bin/kafka-server-start [-daemon] server.properties [--override property=value]*"
         self.assertTrue(expected in utils.run_docker_command(image=self.image, command="kafka-server-start"))
 
+    def test_derive_listeners(self):
+        cmd = "bash -c '. /etc/confluent/docker/bash-functions && derive_listeners \"{listeners}\"'"
+        cases = {
+            "PLAINTEXT://kafka:9092": "PLAINTEXT://0.0.0.0:9092",
+            "SSL://foo:9093,SASL_SSL://bar.example.com:9094": "SSL://0.0.0.0:9093,SASL_SSL://0.0.0.0:9094",
+            "PLAINTEXT://:9092,SASL_PLAINTEXT://[::1]:9095": "PLAINTEXT://0.0.0.0:9092,SASL_PLAINTEXT://0.0.0.0:9095",
+        }
+        for advertised, expected in cases.items():
+            output = utils.run_docker_command(image=self.image, command=cmd.format(listeners=advertised))
+            self.assertEquals(expected, output.strip())
+
 
 class EnterpriseKafkaImageTest(unittest.TestCase):
 
@@ -204,6 +227,8 @@ class ConnectImageTest(unittest.TestCase):
         self.assertTrue(utils.path_exists_in_image(self.image, "/etc/kafka"))
         self.assertTrue(utils.path_exists_in_image(self.image, "/etc/confluent"))
         self.assertTrue(utils.path_exists_in_image(self.image, "/etc/kafka-connect"))
+        self.assertTrue(utils.path_exists_in_image(self.image, "/etc/kafka-connect/plugin-index.json"))
+        self.assertTrue(utils.path_exists_in_image(self.image, "/usr/share/confluent-hub-components/installed-plugins.json"))
 
     def test_boot_scripts_present(self):
         self.assertTrue(utils.path_exists_in_image(self.image, "/etc/confluent/docker/configure"))
@@ -0,0 +1,456 @@
+"""Unit tests of the Python tools in /etc/confluent/docker, run without docker."""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCKER_DIR = os.path.join(CURRENT_DIR, "..", "debian", "base", "include", "etc", "confluent", "docker")
+BASH_FUNCTIONS = os.path.join(DOCKER_DIR, "bash-functions")
+
+# The tools import their shared modules (startup_trace, tool_helpers) from their own dir.
+sys.path.insert(0, DOCKER_DIR)
+sys.dont_write_bytecode = True
+
+
+def load_tool(name):
+    """Imports a tool, whose file name has no .py extension."""
+    path = os.path.join(DOCKER_DIR, name)
+    module_name = name.replace("-", "_")
+    try:
+        from importlib.machinery import SourceFileLoader
+        from importlib.util import module_from_spec, spec_from_loader
+    except ImportError:
+        import imp
+        return imp.load_source(module_name, path)
+    loader = SourceFileLoader(module_name, path)
+    module = module_from_spec(spec_from_loader(module_name, loader))
+    loader.exec_module(module)
+    return module
+
+
+def bash(script):
+    """Runs script after sourcing bash-functions and returns its stdout."""
+    return subprocess.check_output(["bash", "-c", ". %s; %s" % (BASH_FUNCTIONS, script)]).decode("utf-8")
+
+
+class ToolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.environ = dict(os.environ)
+        os.environ["CONFLUENT_STARTUP_TRACE"] = "false"
+        self.dir = tempfile.mkdtemp()
+        self.stdout, self.stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = StringIO(), StringIO()
+
+    def tearDown(self):
+        sys.stdout, sys.stderr = self.stdout, self.stderr
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.dir)
+
+    def path(self, *parts):
+        return os.path.join(self.dir, *parts)
+
+
+class ToolHelpersTest(ToolTest):
+
+    import tool_helpers
+    deploy_connectors = load_tool("deploy-connectors")
+    preload_schemas = load_tool("preload-schemas")
+
+    def test_read_properties(self):
+        with open(self.path("server.properties"), "w") as f:
+            f.write("# comment\nlisteners = http://0.0.0.0:8083\n\nurl=a=b\nflag\n")
+        self.assertEqual(self.tool_helpers.read_properties(self.path("server.properties")),
+                         {"listeners": "http://0.0.0.0:8083", "url": "a=b"})
+
+    def test_prefixed_env(self):
+        os.environ["CONNECT_CONNECTORS_TIMEOUT"] = "60"
+        os.environ["CONNECT_CONNECTORS_PARALLELISM"] = ""
+        env = self.tool_helpers.prefixed_env("CONNECT_CONNECTORS_")
+        self.assertEqual(env("TIMEOUT", "300"), "60")
+        self.assertEqual(env("PARALLELISM", "4"), "4")
+
+    def test_run_parallel(self):
+        done = []
+        self.tool_helpers.run_parallel(done.append, list(range(10)), 3)
+        self.assertEqual(sorted(done), list(range(10)))
+        self.tool_helpers.run_parallel(done.append, [], 3)
+
+    def test_local_host(self):
+        self.assertEqual([self.tool_helpers.local_host(host) for host in ("", "0.0.0.0", "[::]", "[::1]", "broker")],
+                         ["127.0.0.1", "127.0.0.1", "127.0.0.1", "::1", "broker"])
+
+    def responding(self, client_class, *responses):
+        """Returns a client of client_class that answers its requests with responses, in order."""
+        client = client_class("https://0.0.0.0:8083")
+        requests = []
+
+        def request(method, path, body=None):
+            requests.append((method, path))
+            return responses[len(requests) - 1]
+        client.request = request
+        client.requests = requests
+        return client
+
+    def test_retry(self):
+        worker = self.responding(self.deploy_connectors.Worker, (409, {"message": "rebalancing"}), (503, None),
+                                 (201, {"name": "sink"}))
+        self.assertEqual((worker.host, worker.port, worker.https), ("127.0.0.1", 8083, True))
+        self.assertEqual(worker.retry("PUT", "/connectors/sink/config", {}, time.time() + 10, 0),
+                         (201, {"name": "sink"}))
+        self.assertEqual(len(worker.requests), 3)
+
+        registry = self.responding(self.preload_schemas.Registry, (409, {"message": "incompatible"}))
+        self.assertEqual(registry.retry("POST", "/subjects/orders-value/versions", {}, time.time() + 10, 0),
+                         (409, {"message": "incompatible"}))
+
+    def test_retry_deadline(self):
+        registry = self.responding(self.preload_schemas.Registry, (500, {"message": "no master"}))
+        with self.assertRaises(self.preload_schemas.RegistryError) as raised:
+            registry.retry("GET", "/subjects", None, time.time() - 1, 0)
+        self.assertEqual(str(raised.exception), "GET /subjects failed: 500 no master")
+
+
+class DubBatchTest(ToolTest):
+
+    dub_batch = load_tool("dub-batch")
+
+    def test_parse_queued_commands(self):
+        # Arguments with quotes, tabs and new lines survive dub_queue/dub_flush.
+        queued = bash("""dub_queue ensure "it's"; dub_queue path $'a\\tb\\nc' readable; dub_queue ensure ''
+                         printf '%s\\0' "${DUB_QUEUE[@]}" """)
+        commands = self.dub_batch.parse(self.dub_batch.records(queued))
+        self.assertEqual(commands, [("ensure", ["it's"]), ("path", ["a\tb\nc", "readable"]), ("ensure", [""])])
+
+    def test_parse_lines(self):
+        commands = self.dub_batch.parse(self.dub_batch.records("ensure A\n\npath '/x y' writable\n"))
+        self.assertEqual(commands, [("ensure", ["A"]), ("path", ["/x y", "writable"])])
+
+    def test_reports_every_failure_before_rendering(self):
+        template = self.path("test.template")
+        output = self.path("test.properties")
+        with open(template, "w") as f:
+            f.write("name={{ env['DUB_BATCH_TEST'] }}\n")
+        os.environ.pop("DUB_BATCH_TEST_MISSING", None)
+        commands = [
+            ("ensure", ["DUB_BATCH_TEST_MISSING"]),
+            ("path", [self.path("missing"), "readable"]),
+            ("ensure-atleast-one", ["DUB_BATCH_TEST_MISSING", "DUB_BATCH_TEST_MISSING_TOO"]),
+            ("load", ["DUB_BATCH_TEST", self.path("missing-secret")]),
+            ("template", [template, output]),
+        ]
+        self.assertFalse(self.dub_batch.run(commands))
+        errors = sys.stderr.getvalue()
+        self.assertTrue("DUB_BATCH_TEST_MISSING is required." in errors)
+        self.assertTrue("%s does not exist." % self.path("missing") in errors)
+        self.assertTrue("one of (DUB_BATCH_TEST_MISSING,DUB_BATCH_TEST_MISSING_TOO) is required." in errors)
+        # Neither the secrets are loaded nor the templates rendered.
+        self.assertFalse(os.path.exists(output))
+
+    def test_unknown_command(self):
+        self.assertFalse(self.dub_batch.run([("ensure", ["PATH"]), ("frobnicate", [])]))
+        self.assertTrue("Unknown dub command(s): frobnicate" in sys.stderr.getvalue())
+
+    def test_load(self):
+        secret = self.path("secret")
+        with open(secret, "w") as f:
+            f.write("s3cret\n")
+        self.assertTrue(self.dub_batch.run([("path", [secret, "readable"]), ("load", ["DUB_BATCH_TEST", secret])]))
+        self.assertEqual(os.environ["DUB_BATCH_TEST"], "s3cret")
+
+    def test_checksum_of_the_vars_the_template_reads(self):
+        template = self.path("test.template")
+        with open(template, "w") as f:
+            f.write("{{ env_to_props('DUB_BATCH_TEST_', '') }}\nlevel={{ env['DUB_BATCH_LEVEL'] }}\n")
+        os.environ.update({"DUB_BATCH_TEST_A": "1", "DUB_BATCH_LEVEL": "INFO", "DUB_BATCH_SERVICE_HOST": "10.0.0.1"})
+        digest = self.dub_batch.checksum(template)
+
+        # Variables the template does not read, e.g. set by the orchestrator, are ignored.
+        os.environ["DUB_BATCH_SERVICE_HOST"] = "10.0.0.2"
+        os.environ["HOSTNAME"] = "restarted"
+        self.assertEqual(self.dub_batch.checksum(template), digest)
+
+        for name, value in [("DUB_BATCH_TEST_A", "2"), ("DUB_BATCH_TEST_B", "1"), ("DUB_BATCH_LEVEL", "WARN")]:
+            os.environ[name] = value
+            self.assertNotEqual(self.dub_batch.checksum(template), digest, name)
+            digest = self.dub_batch.checksum(template)
+
+    def test_render_skips_unchanged(self):
+        template = self.path("test.template")
+        output = self.path("test.properties")
+        with open(template, "w") as f:
+            f.write("level={{ env['DUB_BATCH_LEVEL'] }}\n")
+        os.environ["DUB_BATCH_LEVEL"] = "INFO"
+        with open(output, "w") as f:
+            f.write("level=INFO\n")
+        with open(self.dub_batch.checksum_file(output), "w") as f:
+            f.write(self.dub_batch.checksum(template) + "\n")
+        # No jinja2 environment is needed to skip the render.
+        self.dub_batch.render(None, template, output)
+        self.assertTrue("===> %s unchanged, skipping render" % output in sys.stdout.getvalue())
+
+
+class PreflightTest(ToolTest):
+
+    preflight = load_tool("preflight")
+
+    def test_parse_queued_checks(self):
+        queued = bash("""preflight_queue "storage:/var/lib/it's" storage-check --mode warn "/var/lib/it's"
+                         printf '%s\\0' "${PREFLIGHT_QUEUE[@]}" """)
+        checks = self.preflight.parse(self.preflight.records(queued))
+        self.assertEqual([(check.name, check.args) for check in checks],
+                         [("storage:/var/lib/it's", ["storage-check", "--mode", "warn", "/var/lib/it's"])])
+
+    def test_all_pass(self):
+        checks = [self.preflight.Check("one", ["true"]), self.preflight.Check("two", ["sh", "-c", "echo ready"])]
+        self.assertTrue(self.preflight.run(checks))
+        output = sys.stdout.getvalue()
+        self.assertTrue("[two] ready" in output)
+        self.assertTrue("===> Preflight check one: ok" in output)
+        self.assertTrue("===> Preflight checks passed" in output)
+
+    def test_first_failure_cancels_the_others(self):
+        started = time.time()
+        checks = [self.preflight.Check("fail", ["sh", "-c", "exit 3"]), self.preflight.Check("slow", ["sleep", "30"])]
+        self.assertFalse(self.preflight.run(checks))
+        self.assertTrue(time.time() - started < 10)
+        self.assertEqual([check.result for check in checks], ["failed (exit code 3)", "cancelled"])
+        self.assertTrue("===> Preflight checks failed" in sys.stdout.getvalue())
+
+    def test_deadline(self):
+        started = time.time()
+        checks = [self.preflight.Check("fast", ["true"]), self.preflight.Check("slow", ["sleep", "30"])]
+        self.assertFalse(self.preflight.run(checks, deadline=0.5))
+        self.assertTrue(time.time() - started < 10)
+        self.assertEqual([check.result for check in checks], ["ok", "timed out"])
+        output = sys.stdout.getvalue()
+        self.assertTrue("===> Preflight deadline of 0.5s exceeded." in output)
+        self.assertTrue("===> Preflight check slow: timed out" in output)
+
+    def test_missing_command(self):
+        self.assertFalse(self.preflight.run([self.preflight.Check("missing", [self.path("missing")])]))
+        self.assertTrue("===> Preflight check missing: failed (exit code 127)" in sys.stdout.getvalue())
+
+
+class PageCacheWarmupTest(ToolTest):
+
+    warmup = load_tool("page-cache-warmup")
+    MB = 1024 * 1024
+
+    def segment(self, partition, base_offset, log_mb, index_mb=0, mtime=None):
+        directory = self.path("logs", partition)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        name = os.path.join(directory, "%020d" % base_offset)
+        for suffix, size in [(".log", log_mb), (".index", index_mb)]:
+            if size:
+                with open(name + suffix, "wb") as f:
+                    f.truncate(int(size * self.MB))
+                if mtime is not None:
+                    os.utime(name + suffix, (mtime, mtime))
+        return name
+
+    def run_warmup(self, per_partition_mb=2, budget_mb=1024, rate_mb=0):
+        args = argparse.Namespace(log_dirs=[self.path("logs"), self.path("missing")],
+                                  per_partition_mb=per_partition_mb, budget_mb=budget_mb, rate_mb=rate_mb)
+        self.warmup.run(args)
+        return sys.stdout.getvalue()
+
+    def test_plan_counts_indexes_against_the_partition_share(self):
+        old = self.segment("orders-0", 0, 1.5, 0.25)
+        new = self.segment("orders-0", 1000, 1.5, 0.25)
+        plan = [(os.path.basename(path), offset, length)
+                for _, path, offset, length in self.warmup.plan_partition(self.path("logs", "orders-0"), 2 * self.MB)]
+        self.assertEqual(plan, [
+            (os.path.basename(new) + ".log", 0, int(1.5 * self.MB)),
+            (os.path.basename(new) + ".index", 0, int(0.25 * self.MB)),
+            # Only the newest part of the older segment fits.
+            (os.path.basename(old) + ".log", int(1.25 * self.MB), int(0.25 * self.MB)),
+        ])
+
+    def test_warms_the_newest_data_of_every_partition(self):
+        self.segment("orders-0", 0, 1.5, 0.25)
+        self.segment("orders-0", 1000, 1.5, 0.25)
+        self.segment("users-0", 0, 0.5)
+        os.makedirs(self.path("logs", "empty-0"))
+        self.assertTrue("===> Warmed 2.5 MB of 2 partitions" in self.run_warmup())
+
+    def test_budget(self):
+        now = time.time()
+        self.segment("orders-0", 0, 1.5, mtime=now - 60)
+        self.segment("users-0", 0, 1.5, mtime=now)
+        touched = []
+        touch = self.warmup.touch
+
+        def record(path, offset, length, throttle):
+            touched.append((os.path.basename(os.path.dirname(path)), length))
+            return touch(path, offset, length, throttle)
+
+        self.warmup.touch = record
+        try:
+            self.assertTrue("===> Warmed 2.0 MB of 2 partitions" in self.run_warmup(budget_mb=2))
+        finally:
+            self.warmup.touch = touch
+        # The most recently modified segments are warmed first, until the budget is used up.
+        self.assertEqual(touched, [("users-0", int(1.5 * self.MB)), ("orders-0", int(0.5 * self.MB))])
+
+    def test_rate(self):
+        self.segment("orders-0", 0, 2)
+        started = time.time()
+        self.assertTrue("===> Warmed 2.0 MB of 1 partitions" in self.run_warmup(rate_mb=2))
+        self.assertTrue(time.time() - started >= 0.9)
+
+
+class TopicSpecsTest(ToolTest):
+
+    topic_specs = load_tool("topic-specs")
+
+    def test_parse_specs(self):
+        topics, errors = self.topic_specs.parse_specs("""
+            # comment
+            orders:12:3:cleanup.policy=compact,min.insync.replicas=2 events:1:1  # trailing comment
+            throttled:2:1:leader.replication.throttled.replicas=0:1,1:1,retention.ms=1000
+            """)
+        self.assertEqual(errors, [])
+        self.assertEqual(topics, [
+            {"name": "orders", "partitions": 12, "replicationFactor": 3,
+             "configs": {"cleanup.policy": "compact", "min.insync.replicas": "2"}},
+            {"name": "events", "partitions": 1, "replicationFactor": 1, "configs": {}},
+            # ":" and "," inside a value.
+            {"name": "throttled", "partitions": 2, "replicationFactor": 1,
+             "configs": {"leader.replication.throttled.replicas": "0:1,1:1", "retention.ms": "1000"}},
+        ])
+
+    def test_reports_every_invalid_spec(self):
+        topics, errors = self.topic_specs.parse_specs(
+            "orders:12 bad/name:1:1 events:0:1 events:x:1 logs:1:1:retention logs:1:1 logs:2:1")
+        self.assertEqual([topic["name"] for topic in topics], ["logs"])
+        self.assertEqual(len(errors), 6)
+        self.assertTrue(errors[0].startswith("Invalid topic spec 'orders:12'"))
+        self.assertTrue(errors[1].startswith("Invalid topic name 'bad/name'"))
+        self.assertTrue("must be positive numbers" in errors[2] and "must be positive numbers" in errors[3])
+        self.assertTrue(errors[4].startswith("Invalid config 'retention'"))
+        self.assertEqual(errors[5], "Topic logs is declared more than once.")
+
+    def test_run(self):
+        specs = self.path("topics")
+        output = self.path("create-topics.json")
+        with open(specs, "w") as f:
+            f.write("events:2:1\n")
+        os.environ["KAFKA_CREATE_TOPICS"] = "orders:4:1:cleanup.policy=compact"
+        self.assertTrue(self.topic_specs.run(argparse.Namespace(file=specs, output=output)))
+        with open(output) as f:
+            self.assertEqual([topic["name"] for topic in json.load(f)], ["orders", "events"])
+
+        os.environ["KAFKA_CREATE_TOPICS"] = "orders:4"
+        self.assertFalse(self.topic_specs.run(argparse.Namespace(file=None, output=output)))
+        self.assertTrue("Invalid topic spec 'orders:4'" in sys.stderr.getvalue())
+
+        # Without topics, the output of a previous start is removed.
+        os.environ["KAFKA_CREATE_TOPICS"] = " "
+        self.assertTrue(self.topic_specs.run(argparse.Namespace(file=None, output=output)))
+        self.assertFalse(os.path.exists(output))
+
+
+class OutputFilterTest(ToolTest):
+
+    def run_filtered(self, command, signal_after=None):
+        script = ". %s; exec_with_output_filter trace_first_output 0 -- bash -c '%s'" % (BASH_FUNCTIONS, command)
+        proc = subprocess.Popen(["bash", "-c", script], stdout=subprocess.PIPE)
+        if signal_after is not None:
+            time.sleep(signal_after)
+            proc.terminate()
+        output, _ = proc.communicate()
+        return proc.returncode, output.decode("utf-8")
+
+    def test_copies_every_line_and_the_exit_status(self):
+        returncode, output = self.run_filtered("echo \"===> launching\"; seq 1 20000; exit 7")
+        self.assertEqual(returncode, 7)
+        lines = output.splitlines()
+        self.assertEqual(lines[0], "===> launching")
+        self.assertEqual(lines[-1], "20000")
+        self.assertEqual(len(lines), 20001)
+
+    def test_forwards_stop_signals(self):
+        returncode, output = self.run_filtered(
+            "trap \"echo stopping; exit 3\" TERM; echo started; while true; do sleep 0.1; done", signal_after=1)
+        self.assertEqual(returncode, 3)
+        self.assertEqual(output.splitlines(), ["started", "stopping"])
+
+
+class LogRecoveryTest(ToolTest):
+
+    def test_stops_tracking_once_every_partition_is_loaded(self):
+        lines = ["[2019-01-01 00:00:00,000] INFO [Log partition=orders-%d] Completed load of log (kafka.log.Log)" % i
+                 for i in range(2)]
+        # Without "Logs loading complete", e.g. when the LogManager line is lost.
+        lines.append("[2019-01-01 00:00:01,000] INFO [KafkaServer id=1] started (kafka.server.KafkaServer)")
+        output = bash("printf '%%s\\n' %s | report_log_recovery 2" % " ".join("'%s'" % line for line in lines))
+        self.assertTrue("===> Log recovery: 2/2 partitions loaded" in output)
+        self.assertTrue("===> Log recovery of 2 partitions finished" in output)
+        self.assertTrue(output.rstrip().endswith("(kafka.server.KafkaServer)"))
+
+    def test_logs_loading_logged(self):
+        log4j = self.path("log4j.properties")
+        with open(log4j, "w") as f:
+            f.write("log4j.rootLogger=WARN, stdout\nlog4j.logger.kafka=INFO\nlog4j.logger.kafka.controller=TRACE\n")
+        self.assertEqual(bash("log4j_level %s kafka.log.LogManager" % log4j).strip(), "INFO")
+        self.assertEqual(bash("log4j_level %s org.apache.zookeeper" % log4j).strip(), "WARN")
+        self.assertEqual(bash("logs_loading_logged %s && echo yes || echo no" % log4j).strip(), "yes")
+        with open(log4j, "a") as f:
+            f.write("log4j.logger.kafka.log=warn\n")
+        self.assertEqual(bash("logs_loading_logged %s && echo yes || echo no" % log4j).strip(), "no")
+
+
+class ReplicationListenerTest(ToolTest):
+
+    def configure(self, **env):
+        os.environ.update(KAFKA_REPLICATION_LISTENER="true", **env)
+        return bash("configure_replication_listener; echo $KAFKA_LISTENER_SECURITY_PROTOCOL_MAP").splitlines()
+
+    def test_protocol_of_the_first_advertised_listener(self):
+        output = self.configure(KAFKA_ADVERTISED_LISTENERS="EXTERNAL://broker-1:9092,INTERNAL://broker-1:9093",
+                                KAFKA_LISTENERS="EXTERNAL://0.0.0.0:9092,INTERNAL://0.0.0.0:9093",
+                                KAFKA_LISTENER_SECURITY_PROTOCOL_MAP="INTERNAL:PLAINTEXT, EXTERNAL:SASL_SSL")
+        self.assertEqual(output, ["===> Replicating over REPLICATION://broker-1:9091 (SASL_SSL)",
+                                  "INTERNAL:PLAINTEXT, EXTERNAL:SASL_SSL,REPLICATION:SASL_SSL"])
+
+    def test_protocol_without_a_map(self):
+        output = self.configure(KAFKA_ADVERTISED_LISTENERS="SSL://broker-1:9092", KAFKA_LISTENERS="SSL://0.0.0.0:9092")
+        self.assertEqual(output, ["===> Replicating over REPLICATION://broker-1:9091 (SSL)", "SSL:SSL,REPLICATION:SSL"])
+
+    def test_protocol_override(self):
+        output = self.configure(KAFKA_ADVERTISED_LISTENERS="SSL://broker-1:9092", KAFKA_LISTENERS="SSL://0.0.0.0:9092",
+                                KAFKA_REPLICATION_LISTENER_PROTOCOL="PLAINTEXT")
+        self.assertEqual(output[0], "===> Replicating over REPLICATION://broker-1:9091 (PLAINTEXT)")
+
+
+class GracefulShutdownTest(ToolTest):
+
+    def test_exits_with_the_status_of_the_stopped_broker(self):
+        os.environ.update({"COMPONENT": "kafka", "KAFKA_GRACEFUL_SHUTDOWN": "true"})
+        script = ". %s; exec_with_graceful_shutdown bash -c '%s'" % (
+            BASH_FUNCTIONS, "trap \"sleep 0.5; exit 5\" TERM; while true; do sleep 0.1; done")
+        proc = subprocess.Popen(["bash", "-c", script], stdout=subprocess.PIPE)
+        time.sleep(1)
+        proc.terminate()
+        output, _ = proc.communicate()
+        self.assertEqual(proc.returncode, 5)
+        self.assertTrue("===> Stopping kafka with a controlled shutdown (timeout 8s) ..." in output.decode("utf-8"))
+        self.assertTrue("(ok)" in output.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
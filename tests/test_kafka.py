@@ -1,6 +1,7 @@
 import os
 import unittest
 import utils
+import rolling_restart
 import time
 import string
 import json
@@ -68,6 +69,8 @@ PLAIN_CLIENTS = """bash -c "\
     && kafka-console-consumer --bootstrap-server {brokers} --topic foo --from-beginning --max-messages {messages}"
     """
 
+CREATE_TOPIC = "bash -c 'kafka-topics --create --topic {topic} --partitions {partitions} --replication-factor {replicas} --if-not-exists --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
+DESCRIBE_TOPIC = "bash -c 'kafka-topics --describe --topic {topic} --zookeeper $KAFKA_ZOOKEEPER_CONNECT'"
 JMX_CHECK = """bash -c "\
     echo 'get -b kafka.server:id=1,type=app-info Version' |
         java -jar jmxterm-1.0-alpha-4-uber.jar -l {jmx_hostname}:{jmx_port} -n -v silent "
@@ -126,6 +129,8 @@ class ConfigTest(unittest.TestCase):
 
         self.assertTrue("KAFKA_OPTS is required." in self.cluster.service_logs("failing-config-sasl-jaas", stopped=True))
         self.assertTrue("KAFKA_OPTS should contain 'java.security.auth.login.config' property." in self.cluster.service_logs("failing-config-sasl-missing-prop", stopped=True))
+        # OS limits
+        self.assertTrue("===> nofile: 4096 (need 65000): fail" in self.cluster.service_logs("failing-config-os-limits", stopped=True))
 
     def test_default_config(self):
         self.is_kafka_healthy_for_service("default-config", 9092, 1)
@@ -179,6 +184,124 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(tools_log4j_props.translate(None, string.whitespace), expected_tools_log4j_props.translate(None, string.whitespace))
 
+    def test_startup_trace(self):
+        self.is_kafka_healthy_for_service("default-config", 9092, 1)
+        trace = self.cluster.run_command_on_service("default-config", "cat /var/log/confluent/startup-trace.json")
+        events = [json.loads(line) for line in trace.splitlines() if line.strip()]
+        steps = [event["step"] for event in events]
+        for step in ["configure", "template /etc/kafka/kafka.properties", "ensure", "zk-ready", "first-log-line", "total"]:
+            self.assertTrue(step in steps)
+        self.assertTrue(all(event["component"] == "kafka" and event["duration_ms"] >= 0 for event in events))
+
+    def test_healthcheck(self):
+        self.is_kafka_healthy_for_service("default-config", 9092, 1)
+        self.assertTrue("kafka live: listening on 127.0.0.1:9092" in self.cluster.run_command_on_service("default-config", "/etc/confluent/docker/healthcheck live"))
+        ready = self.cluster.run_command_on_service("default-config", "/etc/confluent/docker/healthcheck ready")
+        self.assertTrue("kafka ready: broker 1001 is registered and in the ISR of all its" in ready)
+
+    def test_heap_auto_config(self):
+        self.is_kafka_healthy_for_service("heap-auto-config", 9092, 1)
+        # 25% of the 2g container memory limit.
+        cmdline = self.cluster.run_command_on_service("heap-auto-config", "bash -c 'cat /proc/1/cmdline | tr \"\\0\" \" \"'")
+        self.assertTrue("-Xms512m -Xmx512m" in cmdline)
+        props = self.cluster.run_command_on_service("heap-auto-config", "cat /etc/kafka/kafka.properties")
+        self.assertTrue("heap" not in props)
+
+    def test_jvm_profile_config(self):
+        self.is_kafka_healthy_for_service("jvm-profile-config", 9092, 1)
+        cmdline = self.cluster.run_command_on_service("jvm-profile-config", "bash -c 'cat /proc/1/cmdline | tr \"\\0\" \" \"'")
+        self.assertTrue("-XX:+UseParallelGC" in cmdline)
+        # The user's flag comes last, so it wins over the profile's.
+        self.assertTrue("-XX:GCTimeRatio=19" in cmdline)
+        self.assertTrue(cmdline.index("-XX:GCTimeRatio=9") > cmdline.index("-XX:GCTimeRatio=19"))
+
+    def test_auto_tune_config(self):
+        self.is_kafka_healthy_for_service("auto-tune-config", 9092, 1)
+        props = self.cluster.run_command_on_service("auto-tune-config", "bash -c 'cat /etc/kafka/kafka.properties | sort'")
+        # A CPU quota of 1 CPU and the default 1 GB heap; num.io.threads is set by the user.
+        expected = """
+                advertised.listeners=PLAINTEXT://auto-tune-config:9092
+                listeners=PLAINTEXT://0.0.0.0:9092
+                log.cleaner.dedupe.buffer.size=134217728
+                log.dirs=/var/lib/kafka/data
+                num.io.threads=4
+                num.network.threads=2
+                num.recovery.threads.per.data.dir=1
+                num.replica.fetchers=1
+                zookeeper.connect=zookeeper:2181/autotune
+                """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+
+    def test_jbod_config(self):
+        self.is_kafka_healthy_for_service("jbod-config", 9092, 1)
+        props = self.cluster.run_command_on_service("jbod-config", "cat /etc/kafka/kafka.properties")
+        self.assertTrue("log.dirs=/var/lib/kafka/data-1,/var/lib/kafka/data-2" in props)
+        logs = self.cluster.service_logs("jbod-config", stopped=False)
+        self.assertTrue("===> Preflight check log-dir:/var/lib/kafka/data-1: ok" in logs)
+        self.assertTrue("===> Preflight check log-dir:/var/lib/kafka/data-2: ok" in logs)
+
+    def test_page_cache_warmup(self):
+        self.is_kafka_healthy_for_service("warmup-config", 9092, 1)
+        logs = self.cluster.service_logs("warmup-config", stopped=False)
+        self.assertTrue("===> Warmed 0.0 MB of 0 partitions" in logs)
+        props = self.cluster.run_command_on_service("warmup-config", "cat /etc/kafka/kafka.properties")
+        self.assertTrue("warmup" not in props.replace("zookeeper:2181/warmup", ""))
+
+    def test_graceful_shutdown(self):
+        self.is_kafka_healthy_for_service("graceful-shutdown-config", 9092, 1)
+        self.cluster.get_container("graceful-shutdown-config").stop(timeout=90)
+        logs = self.cluster.service_logs("graceful-shutdown-config", stopped=True)
+        self.assertTrue("===> Stopping kafka with a controlled shutdown (timeout 60s) ..." in logs)
+        self.assertTrue("(ok)" in logs.split("===> kafka stopped in ")[1])
+
+    def test_unclean_shutdown_recovery(self):
+        self.is_kafka_healthy_for_service("unclean-shutdown-config", 9092, 1)
+        self.cluster.run_command_on_service("unclean-shutdown-config", "bash -c 'kafka-topics --create --topic recovery --partitions 4 --replication-factor 1 --zookeeper $KAFKA_ZOOKEEPER_CONNECT'")
+        container = self.cluster.get_container("unclean-shutdown-config")
+        container.kill()
+        container.start()
+        self.is_kafka_healthy_for_service("unclean-shutdown-config", 9092, 1)
+        logs = self.cluster.service_logs("unclean-shutdown-config", stopped=False)
+        self.assertTrue("===> Unclean shutdown detected in /var/lib/kafka/data (4 partitions to load)" in logs)
+        self.assertTrue("===> Log recovery of 4 partitions finished in" in logs)
+
+    def test_create_topics(self):
+        self.is_kafka_healthy_for_service("create-topics-config", 9092, 1)
+        for _ in range(30):
+            logs = self.cluster.service_logs("create-topics-config", stopped=False)
+            if "===> Created topics:" in logs:
+                break
+            time.sleep(2)
+        self.assertTrue("===> Created topics: " in logs)
+        topics = self.cluster.run_command_on_service("create-topics-config", "bash -c 'kafka-topics --describe --zookeeper $KAFKA_ZOOKEEPER_CONNECT'")
+        self.assertTrue("Topic:orders\tPartitionCount:4\tReplicationFactor:1\tConfigs:cleanup.policy=compact" in topics)
+        self.assertTrue("Topic:events\tPartitionCount:2\tReplicationFactor:1" in topics)
+        self.assertTrue("Topic:throttled\tPartitionCount:2\tReplicationFactor:1\tConfigs:leader.replication.throttled.replicas=0:1,1:1" in topics)
+
+        # Invalid specs fail the start.
+        logs = self.cluster.service_logs("failing-config-create-topics", stopped=True)
+        self.assertTrue("Invalid topic spec 'orders:4'" in logs)
+        self.assertTrue("Invalid config 'retention' in topic spec 'events:2:1:retention'" in logs)
+        self.assertTrue("(kafka.server.KafkaServer)" not in logs)
+
+    def test_rack_config(self):
+        self.is_kafka_healthy_for_service("rack-config", 9092, 1)
+        props = self.cluster.run_command_on_service("rack-config", "cat /etc/kafka/kafka.properties")
+        self.assertTrue("broker.rack=zone-b" in props)
+
+    def test_replication_listener_config(self):
+        self.is_kafka_healthy_for_service("replication-listener-config", 9092, 1)
+        props = self.cluster.run_command_on_service("replication-listener-config", "bash -c 'cat /etc/kafka/kafka.properties | sort'")
+        expected = """
+                advertised.listeners=PLAINTEXT://replication-listener-config:9092,REPLICATION://replication-listener-config:9091
+                inter.broker.listener.name=REPLICATION
+                listener.security.protocol.map=PLAINTEXT:PLAINTEXT,REPLICATION:PLAINTEXT
+                listeners=PLAINTEXT://0.0.0.0:9092,REPLICATION://0.0.0.0:9091
+                log.dirs=/var/lib/kafka/data
+                zookeeper.connect=zookeeper:2181/replicationlistener
+                """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+
     def test_full_config(self):
         self.is_kafka_healthy_for_service("full-config", 9092, 1)
         props = self.cluster.run_command_on_service("full-config", "bash -c 'cat /etc/kafka/kafka.properties | sort'")
@@ -360,6 +483,8 @@ class StandaloneNetworkingTest(unittest.TestCase):
 
 
 class ClusterBridgedNetworkTest(unittest.TestCase):
+    brokers = ["kafka-1", "kafka-2", "kafka-3"]
+
     @classmethod
     def setUpClass(cls):
         cls.cluster = utils.TestCluster("cluster-test", FIXTURES_DIR, "cluster-bridged-plain.yml")
@@ -402,8 +527,20 @@ class ClusterBridgedNetworkTest(unittest.TestCase):
 
         self.assertTrue("Processed a total of 100 messages" in client_logs)
 
+    def test_rolling_restart(self):
+        # A replicated topic, so that every restarted broker has replicas to catch up on.
+        self.cluster.run_command_on_service(self.brokers[0], CREATE_TOPIC.format(topic="rolling-restart", partitions=6, replicas=3))
+        timings = rolling_restart.RollingRestart(self.cluster, self.brokers).run()
+        self.assertEquals(self.brokers, [step["service"] for step in timings["steps"]])
+        for step in timings["steps"]:
+            self.assertTrue(0 < step["rejoin_s"] <= step["total_s"])
+        topic = self.cluster.run_command_on_service(self.brokers[0], DESCRIBE_TOPIC.format(topic="rolling-restart"))
+        self.assertEquals(6, len([line for line in topic.splitlines() if "Isr: " in line and len(line.split("Isr: ")[1].split(",")) == 3]))
+
 
 class ClusterSSLBridgedNetworkTest(ClusterBridgedNetworkTest):
+    brokers = ["kafka-ssl-1", "kafka-ssl-2", "kafka-ssl-3"]
+
     @classmethod
     def setUpClass(cls):
         machine_name = os.environ["DOCKER_MACHINE_NAME"]
@@ -458,6 +595,8 @@ class ClusterSSLBridgedNetworkTest(ClusterBridgedNetworkTest):
 
 
 class ClusterSASLBridgedNetworkTest(ClusterBridgedNetworkTest):
+    brokers = ["kafka-sasl-ssl-1", "kafka-sasl-ssl-2", "kafka-sasl-ssl-3"]
+
     @classmethod
     def setUpClass(cls):
         machine_name = os.environ["DOCKER_MACHINE_NAME"]
@@ -528,6 +667,18 @@ class ClusterSASLBridgedNetworkTest(ClusterBridgedNetworkTest):
 
         self.assertTrue("Processed a total of 10 messages" in consumer_logs)
 
+    def test_create_topics(self):
+        # Created over the SASL_SSL listener, authenticated with the KafkaClient JAAS section.
+        self.is_kafka_healthy_for_service("kafka-sasl-ssl-1", 9094, 3, "kafka-sasl-ssl-1", "SASL_SSL")
+        for _ in range(30):
+            logs = self.cluster.service_logs("kafka-sasl-ssl-1", stopped=False)
+            if "===> Created topics:" in logs:
+                break
+            time.sleep(2)
+        self.assertTrue("===> Created topics: sasl-topic;" in logs)
+        topic = self.cluster.run_command_on_service("kafka-sasl-ssl-1", DESCRIBE_TOPIC.format(topic="sasl-topic"))
+        self.assertTrue("Topic:sasl-topic\tPartitionCount:3\tReplicationFactor:3\tConfigs:min.insync.replicas=2" in topic)
+
 
 class ClusterHostNetworkTest(unittest.TestCase):
     @classmethod
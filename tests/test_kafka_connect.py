@@ -101,6 +101,24 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
+    def test_healthcheck(self):
+        self.is_connect_healthy_for_service("default-config")
+        self.assertTrue("kafka-connect live: GET http://0.0.0.0:8082/ returned 200" in self.cluster.run_command_on_service("default-config", "/etc/confluent/docker/healthcheck live"))
+        ready = self.cluster.run_command_on_service("default-config", "bash -c 'rm -f /tmp/healthcheck-kafka-connect.json && /etc/confluent/docker/healthcheck ready && /etc/confluent/docker/healthcheck.sh'")
+        self.assertTrue("kafka-connect ready: 0 connectors and 0 tasks on default-config:8082, 0 tasks FAILED\n" in ready)
+        self.assertTrue("0 tasks FAILED (checked 0s ago)" in ready)
+
+    def test_plugin_index(self):
+        self.is_connect_healthy_for_service("default-config")
+        props = self.cluster.run_command_on_service("default-config", "cat /etc/kafka-connect/kafka-connect.properties")
+        self.assertTrue("plugin.path=/etc/kafka-connect/plugins" in props)
+        links = self.cluster.run_command_on_service("default-config", "ls /etc/kafka-connect/plugins").split()
+        self.assertTrue("usr_share_java_kafka" in links)
+        self.assertTrue("usr_share_java_kafka-connect-jdbc" in links)
+        self.assertFalse("usr_share_java_confluent-control-center" in links)
+        logs = self.cluster.service_logs("default-config", stopped=False)
+        self.assertTrue("(0 rescanned)" in logs)
+
     def test_default_config_avro(self):
         self.is_connect_healthy_for_service("default-config-avro")
         props = self.cluster.run_command_on_service("default-config-avro", "bash -c 'cat /etc/kafka-connect/kafka-connect.properties | sort'")
@@ -124,6 +142,22 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
+    def test_client_profile_config(self):
+        self.is_connect_healthy_for_service("client-profile-config")
+        props = self.cluster.run_command_on_service("client-profile-config", "bash -c 'cat /etc/kafka-connect/kafka-connect.properties | grep -E \"^(producer|consumer)\\.\" | sort'")
+        expected = """
+            consumer.fetch.max.wait.ms=500
+            consumer.fetch.min.bytes=1048576
+            consumer.max.partition.fetch.bytes=4194304
+            consumer.max.poll.records=2000
+            producer.batch.size=262144
+            producer.buffer.memory=67108864
+            producer.compression.type=lz4
+            producer.linger.ms=5
+            """
+        self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
+        self.assertFalse("client.profile" in self.cluster.run_command_on_service("client-profile-config", "cat /etc/kafka-connect/kafka-connect.properties"))
+
     def test_default_logging_config(self):
         self.is_connect_healthy_for_service("default-config")
 
@@ -215,6 +249,10 @@ class SingleNodeDistributedTest(unittest.TestCase):
         local_scripts_dir = os.path.join(FIXTURES_DIR, "scripts")
         cls.machine.scp_to_machine(local_scripts_dir, "/tmp/kafka-connect-single-node-test")
 
+        cls.machine.ssh("mkdir -p /tmp/kafka-connect-single-node-test/connectors")
+        local_connectors_dir = os.path.join(FIXTURES_DIR, "connectors")
+        cls.machine.scp_to_machine(local_connectors_dir, "/tmp/kafka-connect-single-node-test")
+
         cls.cluster = utils.TestCluster("distributed-single-node", FIXTURES_DIR, "distributed-single-node.yml")
         cls.cluster.start()
         # assert "PASS" in cls.cluster.run_command_on_service("zookeeper-bridge", ZK_READY.format(servers="localhost:2181"))
@@ -459,6 +497,26 @@ class SingleNodeDistributedTest(unittest.TestCase):
 
         assert "10000" in tmp
 
+    def test_declarative_connectors_on_host_network(self):
+        self.is_connect_healthy_for_service("connect-host-declarative", 48082)
+        for _ in range(60):
+            logs = self.cluster.service_logs("connect-host-declarative", stopped=False)
+            if "===> Deployed 2 connectors" in logs:
+                break
+            time.sleep(1)
+        self.assertTrue("===> Deployed 2 connectors" in logs)
+        self.assertTrue("===> Connector declarative-file-source created in " in logs)
+        self.assertTrue("===> Connector declarative-file-sink created in " in logs)
+        self.assertTrue("RUNNING in " in logs and "tasks: 0=RUNNING" in logs)
+        for name in ("declarative-file-source", "declarative-file-sink"):
+            status = self.cluster.run_command_on_service("connect-host-declarative", CONNECTOR_STATUS.format(host="localhost", port=48082, name=name))
+            self.assertEquals(json.loads(status)["connector"]["state"], "RUNNING")
+
+        # Redeploying leaves the connectors alone, also those with non-string (boolean, number) config values.
+        output = self.cluster.run_command_on_service("connect-host-declarative", "/etc/confluent/docker/deploy-connectors /tmp/test/connectors --url http://localhost:48082")
+        self.assertTrue("===> Connector declarative-file-source unchanged in " in output)
+        self.assertTrue("===> Connector declarative-file-sink unchanged in " in output)
+
     def test_activemq_source_connector_on_host_network_with_avro(self):
 
         activemq_topic_prefix = "one-node-activemq-source-avro-"
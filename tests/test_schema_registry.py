@@ -29,6 +29,11 @@ class ConfigTest(unittest.TestCase):
         machine_name = os.environ["DOCKER_MACHINE_NAME"]
         cls.machine = utils.TestMachine(machine_name)
 
+        # Copy the schemas to preload.
+        cls.machine.ssh("mkdir -p /tmp/schema-registry-config-test/schemas")
+        local_schemas_dir = os.path.join(FIXTURES_DIR, "schemas")
+        cls.machine.scp_to_machine(local_schemas_dir, "/tmp/schema-registry-config-test")
+
         cls.cluster = utils.TestCluster("config-test", FIXTURES_DIR, "standalone-config.yml")
         cls.cluster.start()
 
@@ -56,6 +61,32 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(props.translate(None, string.whitespace), expected.translate(None, string.whitespace))
 
+    def test_healthcheck(self):
+        self.is_schema_registry_healthy_for_service("default-config")
+        self.assertTrue("schema-registry live: GET http://0.0.0.0:8081/ returned 200" in self.cluster.run_command_on_service("default-config", "/etc/confluent/docker/healthcheck live"))
+        self.assertTrue("schema-registry ready: GET http://0.0.0.0:8081/subjects returned 200" in self.cluster.run_command_on_service("default-config", "/etc/confluent/docker/healthcheck ready"))
+
+    def test_preload_schemas(self):
+        self.is_schema_registry_healthy_for_service("preload-config")
+        for _ in range(60):
+            logs = self.cluster.service_logs("preload-config", stopped=False)
+            if "===> Preloaded 2 subjects" in logs:
+                break
+            time.sleep(1)
+        self.assertTrue("===> Preloaded 2 subjects in " in logs)
+        self.assertTrue("3 schemas registered, 0 failed" in logs)
+        self.assertTrue("===> Subject preload-orders-value preloaded in " in logs)
+        self.assertTrue("v1.avsc registered (id " in logs and "v2.avsc registered (id " in logs)
+        subjects = self.cluster.run_command_on_service("preload-config", "curl -s localhost:8081/subjects")
+        self.assertEquals(sorted(json.loads(subjects)), ["preload-orders-value", "preload-users-key"])
+        versions = self.cluster.run_command_on_service("preload-config", "curl -s localhost:8081/subjects/preload-orders-value/versions")
+        self.assertEquals(json.loads(versions), [1, 2])
+
+        # A second run finds the schemas registered.
+        output = self.cluster.run_command_on_service("preload-config", "/etc/confluent/docker/preload-schemas /tmp/test/schemas")
+        self.assertTrue("0 schemas registered, 0 failed" in output)
+        self.assertTrue("v2.avsc exists (version 2, id " in output)
+
     def test_default_config_kafka(self):
         self.is_schema_registry_healthy_for_service("default-config-kafka")
         props = self.cluster.run_command_on_service("default-config", "cat /etc/schema-registry/schema-registry.properties")
@@ -132,9 +132,35 @@ class ConfigTest(unittest.TestCase):
             """
         self.assertEquals(tools_log4j_props.translate(None, string.whitespace), expected_tools_log4j_props.translate(None, string.whitespace))
 
+    def test_template_cache(self):
+        self.is_zk_healthy_for_service("template-cache-config", 2181)
+        logs = self.cluster.service_logs("template-cache-config", stopped=False)
+        self.assertTrue("===> /etc/kafka/zookeeper.properties rendered (config changed)" in logs)
+
+        # The restarted container gets a new start time, PWD etc. but the same
+        # ZOOKEEPER_ vars, so its configs are not rendered again.
+        container = self.cluster.get_container("template-cache-config")
+        container.stop(timeout=30)
+        container.start()
+        self.is_zk_healthy_for_service("template-cache-config", 2181)
+        logs = self.cluster.service_logs("template-cache-config", stopped=False)
+        self.assertTrue("===> /etc/kafka/zookeeper.properties unchanged, skipping render" in logs)
+        self.assertTrue("===> /etc/kafka/log4j.properties unchanged, skipping render" in logs)
+
     def test_volumes(self):
         self.is_zk_healthy_for_service("external-volumes", 2181)
 
+    def test_storage_check(self):
+        self.is_zk_healthy_for_service("storage-check-config", 2181)
+        logs = self.cluster.service_logs("storage-check-config", stopped=False)
+        self.assertTrue("===> /var/lib/zookeeper/data: sequential write" in logs)
+        self.assertTrue("===> /var/lib/zookeeper/log: sequential write" in logs)
+        self.assertTrue("===> Preflight check storage:/var/lib/zookeeper/log: ok" in logs)
+
+        logs = self.cluster.service_logs("failing-config-storage-check", stopped=True)
+        self.assertTrue("average fsync latency" in logs)
+        self.assertTrue("===> Preflight checks failed" in logs)
+
     def test_sasl_config(self):
         self.is_zk_healthy_for_service("sasl-config", 52181, "sasl-config")
 